@@ -1,11 +1,24 @@
+import base64
+import calendar
+import hashlib
+import hmac
+import os
+import secrets
+import ssl
+import threading
+import time
+import warnings
+from functools import lru_cache
+import orjson
+from cachetools import TTLCache
 from passlib.context import CryptContext
-from jose import JWTError, jwt
+import jwt
+from jwt import InvalidTokenError as JWTError
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import NamedTuple, Optional, Tuple
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from database import get_db
+from database import AsyncSessionLocal
 from models import LoginInformation, UserType
 
 # Security configuration
@@ -13,16 +26,99 @@ SECRET_KEY = "your-secret-key-change-this-in-production"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 1440
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# base64url('{"alg":"HS256","typ":"JWT"}'), the only header this service issues
+_JWT_HEADER_B64 = b"eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9"
+_SECRET_KEY_BYTES = SECRET_KEY.encode()
+
+# HS256 cost is all SHA-256; hashlib's OpenSSL constructor uses the CPU's SHA
+# extensions where present, CPython's builtin fallback does not
+if hashlib.sha256.__name__ != "openssl_sha256" or ssl.OPENSSL_VERSION_INFO < (1, 1, 0):
+    warnings.warn(
+        f"hashlib.sha256 is not OpenSSL-backed ({ssl.OPENSSL_VERSION}); JWT signing will be slower",
+        RuntimeWarning
+    )
+
+# New hashes use argon2id; existing bcrypt hashes still verify. Costs are
+# pinned rather than left to library defaults - recalibrate with
+# pwd_context.update(...) to land around 100ms per hash on prod hardware.
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__time_cost=2,
+    argon2__memory_cost=19456,
+    argon2__parallelism=1,
+    bcrypt__rounds=12,
+)
+# Configured argon2 handler, resolved once so the hot path skips the
+# context's per-call scheme lookup; legacy hashes still go through pwd_context
+_argon2 = pwd_context.handler("argon2")
+# Verified against when the username is unknown, so a failed login costs
+# one hash either way. Use LEGACY_DUMMY_HASH while bcrypt hashes remain:
+# bcrypt is the slower scheme, and those accounts only move to argon2id as
+# their owners log in.
+DUMMY_HASH = _argon2.hash(secrets.token_urlsafe(16))
+LEGACY_DUMMY_HASH = pwd_context.handler("bcrypt").hash(secrets.token_urlsafe(16))
+# Deliberately weak argon2id costs for seed/dev data only; see hash_password_fast
+_argon2_fast = _argon2.using(time_cost=1, memory_cost=128, parallelism=1)
 security = HTTPBearer()
 
+# Recent verify results, keyed by an HMAC of (password, hash) under a random
+# per-process key so no plaintext is held. In-memory and per-worker only.
+_verify_cache = TTLCache(maxsize=1024, ttl=60)
+_verify_cache_lock = threading.Lock()
+_VERIFY_CACHE_KEY = secrets.token_bytes(32)
+
+# Authenticated users by id, so most requests skip the login lookup. Token
+# expiry and the short TTL bound staleness; call invalidate_cached_user
+# after changing a login's username or type.
+_user_cache = TTLCache(maxsize=2048, ttl=30)
+
+class CurrentUser(NamedTuple):
+    """Snapshot of the authenticated login, enough for the role checks"""
+    id: str
+    username: str
+    user_type: UserType
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    cache_key = hmac.new(
+        _VERIFY_CACHE_KEY,
+        plain_password.encode() + b"\0" + hashed_password.encode(),
+        "sha256"
+    ).digest()
+    with _verify_cache_lock:
+        cached = _verify_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    if _argon2.identify(hashed_password):
+        result = _argon2.verify(plain_password, hashed_password)
+    else:
+        result = pwd_context.verify(plain_password, hashed_password)
+    with _verify_cache_lock:
+        _verify_cache[cache_key] = result
+    return result
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password; also return a new argon2id hash if the stored one is outdated"""
+    if not pwd_context.needs_update(hashed_password):
+        return verify_password(plain_password, hashed_password), None
+    return pwd_context.verify_and_update(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     """Hash a password"""
-    return pwd_context.hash(password)
+    return _argon2.hash(password)
+
+def hash_password_fast(password: str) -> str:
+    """
+    Hash a password with minimal argon2id costs when SEED_FAST_HASH=1, for
+    seed and dev data only; otherwise identical to get_password_hash.
+    The hashes still verify normally, they are just cheap to brute-force.
+    """
+    if os.environ.get("SEED_FAST_HASH") == "1":
+        return _argon2_fast.hash(password)
+    return get_password_hash(password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token"""
@@ -32,14 +128,32 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     else:
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
+    to_encode.update({"exp": calendar.timegm(expire.utctimetuple())})
+    # Signed by hand: the header never changes, so only the claims are
+    # serialized per token. decode_token still verifies through PyJWT, which
+    # uses the same hashlib.sha256 and a constant-time hmac.compare_digest.
+    signing_input = _JWT_HEADER_B64 + b"." + _b64url(orjson.dumps(to_encode))
+    signature = hmac.new(_SECRET_KEY_BYTES, signing_input, hashlib.sha256).digest()
+    return (signing_input + b"." + _b64url(signature)).decode()
+
+def _b64url(data: bytes) -> bytes:
+    """Unpadded base64url encoding used by JWS"""
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+@lru_cache(maxsize=4096)
+def _decode_cached(token: str) -> tuple:
+    """Verify and decode a token once; repeat calls for it are served from the LRU"""
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    return tuple(sorted(payload.items()))
 
 def decode_token(token: str) -> dict:
     """Decode JWT token"""
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = dict(_decode_cached(token))
+        # Cached payloads outlive their first check, so expiry is re-checked here
+        exp = payload.get("exp")
+        if exp is not None and exp < time.time():
+            raise jwt.ExpiredSignatureError("Signature has expired")
         return payload
     except JWTError:
         raise HTTPException(
@@ -49,9 +163,8 @@ def decode_token(token: str) -> dict:
         )
 
 async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> LoginInformation:
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> CurrentUser:
     """Get current authenticated user from JWT token"""
     token = credentials.credentials
     payload = decode_token(token)
@@ -63,44 +176,44 @@ async def get_current_user(
             detail="Could not validate credentials"
         )
     
-    user = db.query(LoginInformation).filter(LoginInformation.id == user_id).first()
+    cached = _user_cache.get(user_id)
+    if cached is not None:
+        return cached
+    
+    # Own short-lived session rather than a dependency, so the connection
+    # goes back as soon as the lookup is done, not when the response is sent
+    async with AsyncSessionLocal() as db:
+        user = await db.get(LoginInformation, user_id)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found"
         )
     
-    return user
-
-async def require_staff(
-    current_user: LoginInformation = Depends(get_current_user)
-) -> LoginInformation:
-    """Require user to be staff or admin"""
-    if current_user.user_type not in [UserType.STAFF, UserType.ADMIN]:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Staff access required"
-        )
+    current_user = CurrentUser(id=user.id, username=user.username, user_type=user.user_type)
+    _user_cache[user_id] = current_user
     return current_user
 
-async def require_interpreter(
-    current_user: LoginInformation = Depends(get_current_user)
-) -> LoginInformation:
-    """Require user to be interpreter"""
-    if current_user.user_type != UserType.INTERPRETER:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Interpreter access required"
-        )
-    return current_user
+def invalidate_cached_user(user_id: str) -> None:
+    """Drop a user from the auth cache after their login record changes"""
+    _user_cache.pop(user_id, None)
 
-async def require_admin(
-    current_user: LoginInformation = Depends(get_current_user)
-) -> LoginInformation:
-    """Require user to be admin"""
-    if current_user.user_type != UserType.ADMIN:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Admin access required"
-        )
-    return current_user
\ No newline at end of file
+def require_roles(*roles: UserType, detail: str = "Insufficient permissions"):
+    """Build a dependency that only admits users whose type is in roles"""
+    allowed = frozenset(roles)
+
+    async def dependency(
+        current_user: CurrentUser = Depends(get_current_user)
+    ) -> CurrentUser:
+        if current_user.user_type not in allowed:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=detail
+            )
+        return current_user
+
+    return dependency
+
+require_staff = require_roles(UserType.STAFF, UserType.ADMIN, detail="Staff access required")
+require_interpreter = require_roles(UserType.INTERPRETER, detail="Interpreter access required")
+require_admin = require_roles(UserType.ADMIN, detail="Admin access required")
@@ -1,19 +1,52 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from models import Base
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///./interpreter_booking.db"
+ASYNC_SQLALCHEMY_DATABASE_URL = SQLALCHEMY_DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1)
+
+# Sync `def` handlers each hold a worker thread and a pooled connection, so
+# the threadpool (sized from THREADPOOL_SIZE at startup) and the pool are
+# kept the same size: a request that got a thread never queues for a
+# connection. Change these together.
+DB_POOL_SIZE = 30
+DB_MAX_OVERFLOW = 10
+THREADPOOL_SIZE = DB_POOL_SIZE + DB_MAX_OVERFLOW
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL, 
-    connect_args={"check_same_thread": False}
+    connect_args={"check_same_thread": False},
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# For multi-row insert(): keep None values in the statement, so rows with
+# different missing fields still go in as one INSERT batch
+BULK_INSERT_OPTIONS = {"render_nulls": True}
+
+# Async engine for `async def` handlers, which must not block the event loop.
+# Plain `def` handlers already run in the threadpool and keep using SessionLocal.
+async_engine = create_async_engine(ASYNC_SQLALCHEMY_DATABASE_URL)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# Single-column language indexes superseded by the composite indexes in models.py.
+LEGACY_INDEXES = ("ix_interpreter_data_language", "ix_interpreter_requests_language")
+
 def init_db():
     """Initialize database tables"""
     Base.metadata.create_all(bind=engine)
+    # create_all skips tables that already exist, so an existing database
+    # would never pick up index changes. Bring its indexes in line here.
+    with engine.begin() as conn:
+        for name in LEGACY_INDEXES:
+            conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
 
 def get_db():
     """Dependency for FastAPI to get database session"""
@@ -21,4 +54,9 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    """Dependency for async FastAPI handlers to get an AsyncSession"""
+    async with AsyncSessionLocal() as db:
+        yield db
\ No newline at end of file
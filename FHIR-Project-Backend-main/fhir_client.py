@@ -1,27 +1,123 @@
 # fhir_client.py - Copy this entire file
 
+import asyncio
+import logging
 import httpx
-from typing import Optional, List, Dict, Any
+import ijson
+import orjson
+from cachetools import TTLCache
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
+
+from fhir_parser import PATIENT_ELEMENTS, parse_patient_resource
+
+log = logging.getLogger(__name__)
+
+# (patient_data key, FHIR telecom system, extra ContactPoint fields)
+_TELECOM_FIELDS: Tuple[Tuple[str, str, Dict[str, str]], ...] = (
+    ("phone_number", "phone", {"use": "mobile"}),
+    ("email", "email", {}),
+)
+
+async def _log_http_version(response: httpx.Response) -> None:
+    """Log the negotiated protocol (HTTP/1.1 or HTTP/2) of each FHIR response"""
+    log.debug("FHIR %s %s -> %s", response.request.method, response.request.url, response.http_version)
 
 class FHIRClient:
-    def __init__(self, base_url: str = "http://hapi.fhir.org/baseR4"):
+    def __init__(self, base_url: str = "https://hapi.fhir.org/baseR4"):
         """
         Initialize FHIR client
         Default uses public HAPI FHIR test server
         """
-        self.base_url = base_url.rstrip('/')
+        # httpx joins base_url and request paths itself, trailing slash or not
+        self.base_url = base_url
         self.timeout = 30.0
+
+        # One pooled client for the lifetime of the app so requests reuse
+        # keep-alive connections instead of paying a new handshake per call.
+        # It is opened by startup() (or `async with`), not at import time.
+        self._client: Optional[httpx.AsyncClient] = None
+
+        # Short-lived, per-process caches of FHIR reads: demographics rarely
+        # change, and the same patient is often viewed or synced repeatedly
+        self._patient_cache: TTLCache = TTLCache(maxsize=1024, ttl=300)
+        self._search_cache: TTLCache = TTLCache(maxsize=256, ttl=30)
+
+    async def startup(self) -> None:
+        """Open the shared connection pool; reopens it after an aclose()"""
+        if self._client is None or self._client.is_closed:
+            # HTTP/2 lets concurrent requests multiplex over one connection.
+            # httpx only negotiates it over TLS (ALPN), so an http:// base_url
+            # gets HTTP/1.1; the debug log shows which version was used.
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                http2=True,
+                headers={"Accept": "application/fhir+json"},
+                limits=httpx.Limits(max_keepalive_connections=50, max_connections=100),
+                event_hooks={"response": [_log_http_version]},
+            )
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP connection pool"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @property
+    def _http(self) -> httpx.AsyncClient:
+        if self._client is None:
+            raise RuntimeError("FHIRClient is not open; call startup() or use 'async with'")
+        return self._client
+
+    async def __aenter__(self) -> "FHIRClient":
+        await self.startup()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
     
-    async def get_patient(self, patient_id: str) -> Optional[Dict[str, Any]]:
-        """Fetch a single patient by FHIR ID"""
+    async def get_patient(
+        self,
+        patient_id: str,
+        elements: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Fetch a single patient by FHIR ID
+        Pass elements (e.g. PATIENT_ELEMENTS) to have the server return only those fields
+        """
+        cache_key = (patient_id, elements)
+        cached = self._patient_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(f"{self.base_url}/Patient/{patient_id}")
-                response.raise_for_status()
-                return response.json()
+            params = {"_elements": elements} if elements else None
+            response = await self._http.get("/Patient/" + patient_id, params=params)
+            response.raise_for_status()
+            patient = orjson.loads(response.content)
         except httpx.HTTPError as e:
-            print(f"Error fetching patient {patient_id}: {e}")
+            log.warning("Error fetching patient %s: %s", patient_id, e)
             return None
+
+        self._patient_cache[cache_key] = patient
+        return patient
+
+    async def get_patients(
+        self,
+        patient_ids: List[str],
+        concurrency: int = 16
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Fetch several patients concurrently, at most `concurrency` in flight
+        Results are returned in the same order as patient_ids, None for misses
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(patient_id: str) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                return await self.get_patient(patient_id)
+
+        return await asyncio.gather(*(fetch(pid) for pid in patient_ids))
     
     async def search_patients(
         self, 
@@ -33,28 +129,67 @@ class FHIRClient:
         Search for patients with optional filters
         Returns list of patient resources
         """
+        name = (name or "").strip() or None
+        language = (language or "").strip() or None
+        # Key on exactly what is sent. Only name is case-folded: it is a
+        # string search (case-insensitive), language is a case-sensitive token
+        cache_key = (name.lower() if name else None, language, count)
+        cached = self._search_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
-            params = {"_count": count}
-            if name:
-                params["name"] = name
-            if language:
-                params["language"] = language
-            
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    f"{self.base_url}/Patient",
-                    params=params
-                )
-                response.raise_for_status()
-                bundle = response.json()
-                
-                # Extract entries from bundle
-                if bundle.get("entry"):
-                    return [entry["resource"] for entry in bundle["entry"]]
-                return []
+            patients = [
+                patient async for patient in self._iter_search(name, language, count)
+            ]
         except httpx.HTTPError as e:
-            print(f"Error searching patients: {e}")
+            log.warning("Error searching patients: %s", e)
             return []
+
+        self._search_cache[cache_key] = patients
+        return patients
+
+    async def search_patients_stream(
+        self,
+        name: Optional[str] = None,
+        language: Optional[str] = None,
+        count: int = 20
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Search for patients, yielding each patient resource as the Bundle arrives
+        Entries are parsed incrementally, so the full Bundle is never held in memory
+        """
+        try:
+            async for patient in self._iter_search(name, language, count):
+                yield patient
+        except httpx.HTTPError as e:
+            log.warning("Error searching patients: %s", e)
+
+    async def _iter_search(
+        self,
+        name: Optional[str],
+        language: Optional[str],
+        count: int
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream-parse a /Patient search Bundle; HTTP errors propagate to the caller"""
+        params: Dict[str, Union[str, int]] = {"_count": count, "_elements": PATIENT_ELEMENTS}
+        if name:
+            params["name"] = name
+        if language:
+            params["language"] = language
+        
+        async with self._http.stream("GET", "/Patient", params=params) as response:
+            response.raise_for_status()
+            resources = ijson.sendable_list()
+            parser = ijson.items_coro(resources, "entry.item.resource", use_float=True)
+            async for chunk in response.aiter_bytes():
+                parser.send(chunk)
+                for resource in resources:
+                    yield resource
+                del resources[:]
+            parser.close()
+            for resource in resources:
+                yield resource
     
     async def create_appointment(self, appointment_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
@@ -62,75 +197,22 @@ class FHIRClient:
         Note: Based on requirements, we're not using this, but included for completeness
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}/Appointment",
-                    json=appointment_data,
-                    headers={"Content-Type": "application/fhir+json"}
-                )
-                response.raise_for_status()
-                return response.json()
+            response = await self._http.post(
+                "/Appointment",
+                content=orjson.dumps(appointment_data),
+                headers={"Content-Type": "application/fhir+json"}
+            )
+            response.raise_for_status()
+            return orjson.loads(response.content)
         except httpx.HTTPError as e:
-            print(f"Error creating appointment: {e}")
+            log.warning("Error creating appointment: %s", e)
             return None
     
     def parse_patient_resource(self, fhir_patient: Dict[str, Any]) -> Dict[str, Any]:
         """
         Parse FHIR Patient resource into simplified format for our database
         """
-        patient_data = {
-            "fhir_id": fhir_patient.get("id"),
-            "name": self._get_patient_name(fhir_patient),
-            "gender": fhir_patient.get("gender"),
-            "birthdate": fhir_patient.get("birthDate"),
-            "phone_number": self._get_telecom(fhir_patient, "phone"),
-            "email": self._get_telecom(fhir_patient, "email"),
-            "address": self._get_address(fhir_patient),
-            "language": self._get_language(fhir_patient),
-        }
-        return patient_data
-    
-    def _get_patient_name(self, patient: Dict[str, Any]) -> str:
-        """Extract patient name from FHIR name array"""
-        names = patient.get("name", [])
-        if names:
-            name = names[0]
-            given = " ".join(name.get("given", []))
-            family = name.get("family", "")
-            return f"{given} {family}".strip()
-        return "Unknown"
-    
-    def _get_telecom(self, patient: Dict[str, Any], system: str) -> Optional[str]:
-        """Extract telecom value (phone/email) from FHIR telecom array"""
-        telecoms = patient.get("telecom", [])
-        for telecom in telecoms:
-            if telecom.get("system") == system:
-                return telecom.get("value")
-        return None
-    
-    def _get_address(self, patient: Dict[str, Any]) -> Optional[str]:
-        """Extract address from FHIR address array"""
-        addresses = patient.get("address", [])
-        if addresses:
-            addr = addresses[0]
-            lines = addr.get("line", [])
-            city = addr.get("city", "")
-            state = addr.get("state", "")
-            postal = addr.get("postalCode", "")
-            return f"{', '.join(lines)}, {city}, {state} {postal}".strip(", ")
-        return None
-    
-    def _get_language(self, patient: Dict[str, Any]) -> str:
-        """Extract primary language from FHIR communication array"""
-        communications = patient.get("communication", [])
-        if communications:
-            for comm in communications:
-                if comm.get("preferred"):
-                    language = comm.get("language", {})
-                    codings = language.get("coding", [])
-                    if codings:
-                        return codings[0].get("display", "English")
-        return "English"  # Default fallback
+        return parse_patient_resource(fhir_patient)
 
     async def create_patient(self, patient_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
@@ -151,14 +233,16 @@ class FHIRClient:
         """
         try:
             # Build FHIR Patient resource
+            full_name = patient_data.get("name")
+            name_parts = full_name.split() if full_name else []
             fhir_patient = {
                 "resourceType": "Patient",
                 "name": [
                     {
                         "use": "official",
-                        "text": patient_data.get("name"),
-                        "family": patient_data.get("name", "").split()[-1] if patient_data.get("name") else "",
-                        "given": patient_data.get("name", "").split()[:-1] if patient_data.get("name") else []
+                        "text": full_name,
+                        "family": name_parts[-1] if name_parts else "",
+                        "given": name_parts[:-1]
                     }
                 ],
                 "gender": patient_data.get("gender", "unknown"),
@@ -166,18 +250,11 @@ class FHIRClient:
             }
 
             # Add telecom (phone and email)
-            telecom = []
-            if patient_data.get("phone_number"):
-                telecom.append({
-                    "system": "phone",
-                    "value": patient_data.get("phone_number"),
-                    "use": "mobile"
-                })
-            if patient_data.get("email"):
-                telecom.append({
-                    "system": "email",
-                    "value": patient_data.get("email")
-                })
+            telecom = [
+                {"system": system, "value": patient_data[field], **extra}
+                for field, system, extra in _TELECOM_FIELDS
+                if patient_data.get(field)
+            ]
             if telecom:
                 fhir_patient["telecom"] = telecom
 
@@ -209,15 +286,33 @@ class FHIRClient:
                 ]
 
             # POST to FHIR server
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}/Patient",
-                    json=fhir_patient,
-                    headers={"Content-Type": "application/fhir+json"}
-                )
-                response.raise_for_status()
-                return response.json()
+            response = await self._http.post(
+                "/Patient",
+                content=orjson.dumps(fhir_patient),
+                headers={"Content-Type": "application/fhir+json"}
+            )
+            response.raise_for_status()
+            # A new patient can match searches cached before it existed
+            self._search_cache.clear()
+            return orjson.loads(response.content)
 
         except httpx.HTTPError as e:
-            print(f"Error creating patient in FHIR: {e}")
-            return None
\ No newline at end of file
+            log.warning("Error creating patient in FHIR: %s", e)
+            return None
+
+    async def create_patients(
+        self,
+        patients_data: List[Dict[str, Any]],
+        concurrency: int = 16
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Create several patients concurrently, at most `concurrency` in flight
+        Results are returned in the same order as patients_data, None for failures
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def create(patient_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                return await self.create_patient(patient_data)
+
+        return await asyncio.gather(*(create(p) for p in patients_data))
\ No newline at end of file
@@ -0,0 +1,73 @@
+# fhir_parser.py - FHIR Patient -> local patient_data mapping
+#
+# Pure, fully typed dict walking with no I/O, kept apart from FHIRClient so it
+# can be compiled with mypyc (`mypyc fhir_parser.py`) for large Bundles. When
+# no compiled build is present the plain Python module is imported as usual.
+# A compiled build checks annotations at runtime, so values taken straight
+# from the server are typed Any: both builds accept the same resources.
+
+from typing import Any, Dict, Optional
+
+# Patient fields read by parse_patient_resource, for _elements projections
+PATIENT_ELEMENTS = "id,name,gender,birthDate,telecom,address,communication"
+
+def parse_patient_resource(fhir_patient: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Parse FHIR Patient resource into simplified format for our database
+    """
+    telecoms = _get_telecoms(fhir_patient)
+    patient_data = {
+        "fhir_id": fhir_patient.get("id"),
+        "name": _get_patient_name(fhir_patient),
+        "gender": fhir_patient.get("gender"),
+        "birthdate": fhir_patient.get("birthDate"),
+        "phone_number": telecoms.get("phone"),
+        "email": telecoms.get("email"),
+        "address": _get_address(fhir_patient),
+        "language": _get_language(fhir_patient),
+    }
+    return patient_data
+
+def _get_patient_name(patient: Dict[str, Any]) -> str:
+    """Extract patient name from FHIR name array"""
+    names = patient.get("name", [])
+    if names:
+        name = names[0]
+        given = " ".join(name.get("given", []))
+        family = name.get("family", "")
+        return f"{given} {family}".strip()
+    return "Unknown"
+
+def _get_telecoms(patient: Dict[str, Any]) -> Dict[Any, Any]:
+    """Map each telecom system (phone/email/...) to its first value in one pass"""
+    telecoms: Dict[Any, Any] = {}
+    for telecom in patient.get("telecom", []):
+        telecoms.setdefault(telecom.get("system"), telecom.get("value"))
+    return telecoms
+
+def _get_address(patient: Dict[str, Any]) -> Optional[str]:
+    """Extract address from FHIR address array"""
+    addresses = patient.get("address", [])
+    if addresses:
+        addr = addresses[0]
+        state = addr.get("state", "")
+        postal = addr.get("postalCode", "")
+        parts = (
+            ", ".join(addr.get("line", [])),
+            addr.get("city", ""),
+            f"{state} {postal}".strip(),
+        )
+        return ", ".join([part for part in parts if part]) or None
+    return None
+
+def _get_language(patient: Dict[str, Any]) -> Any:
+    """Extract primary language from FHIR communication array"""
+    communications = patient.get("communication", [])
+    if communications:
+        for comm in communications:
+            if comm.get("preferred"):
+                language = comm.get("language", {})
+                codings = language.get("coding", [])
+                if codings:
+                    return codings[0].get("display", "English")
+    return "English"  # Default fallback
@@ -1,10 +1,16 @@
+import os
+
+import anyio
 from fastapi import FastAPI, Depends, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import bindparam, case, exists, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, defer, selectinload
 from typing import List, Optional
 from datetime import datetime
 
-from database import get_db, init_db
+from database import BULK_INSERT_OPTIONS, THREADPOOL_SIZE, async_engine, get_async_db, get_db, init_db
 from models import (
     LoginInformation, PatientData, InterpreterData, InterpreterRequest,
     UserType, RequestStatus, InterpreterAvailability
@@ -13,30 +19,96 @@ from schemas import (
     LoginRequest, UserCreate, UserResponse,
     PatientCreate, PatientResponse,
     InterpreterCreate, InterpreterUpdate, InterpreterResponse, InterpreterWithLogin,
-    RequestCreate, RequestUpdate, RequestResponse, RequestWithDetails,
-    DashboardStats, AvailabilityStats, RequestAccept
+    RequestCreate, RequestUpdate, RequestResponse, RequestWithDetails, RequestListItem,
+    DashboardStats, AvailabilityStats
 )
 from auth import (
-    get_password_hash, verify_password, create_access_token,
-    get_current_user, require_staff, require_interpreter
+    get_password_hash, verify_password, verify_and_update_password, create_access_token,
+    get_current_user, require_staff, require_interpreter, CurrentUser,
+    DUMMY_HASH, LEGACY_DUMMY_HASH
+)
+from fhir_client import FHIRClient, PATIENT_ELEMENTS
+
+app = FastAPI(
+    title="Interpreter Booking System API",
+    default_response_class=ORJSONResponse
 )
-from fhir_client import FHIRClient
 
-app = FastAPI(title="Interpreter Booking System API")
+# Explicit origins, methods and headers: with credentials allowed, "*"
+# makes Starlette echo the request's Origin and headers back on every
+# call. max_age lets browsers reuse a preflight for a day.
+CORS_ORIGINS = [
+    origin.strip()
+    for origin in os.environ.get(
+        "CORS_ORIGINS", "http://localhost:3000,http://127.0.0.1:3000"
+    ).split(",")
+    if origin.strip()
+]
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PATCH", "OPTIONS"],
+    allow_headers=["Authorization", "Content-Type"],
+    max_age=86400,
 )
 
 fhir_client = FHIRClient()
 
+# Hot-path statements, built once at import instead of per request. Each
+# call only binds parameters, and the statement's compiled SQL is reused
+# from the engine's cache.
+STMT_INTERPRETER_BY_LOGIN = select(InterpreterData).where(
+    InterpreterData.login_id == bindparam("login_id")
+)
+
+# Pending requests have no interpreter yet, so only patients need loading
+STMT_PENDING_BY_LANG = select(InterpreterRequest).options(
+    selectinload(InterpreterRequest.patient)
+).where(
+    InterpreterRequest.language == bindparam("lang"),
+    InterpreterRequest.status == RequestStatus.PENDING
+).order_by(InterpreterRequest.is_stat.desc(), InterpreterRequest.requested_at)
+
+STMT_REQUEST_WITH_DETAILS = select(InterpreterRequest).options(
+    selectinload(InterpreterRequest.patient),
+    selectinload(InterpreterRequest.interpreter)
+).where(InterpreterRequest.id == bindparam("request_id"))
+
+def get_current_interpreter(
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(require_interpreter)
+) -> InterpreterData:
+    """
+    Interpreter profile of the logged-in user. FastAPI caches dependencies
+    per request, so the profile is fetched once however many dependants
+    ask for it, and it shares the handler's Session (get_db is cached too).
+    """
+    interpreter = db.execute(
+        STMT_INTERPRETER_BY_LOGIN, {"login_id": current_user.id}
+    ).scalar_one_or_none()
+
+    if not interpreter:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Interpreter profile not found"
+        )
+
+    return interpreter
+
 @app.on_event("startup")
 async def startup_event():
+    # Starlette runs `def` handlers on anyio's worker threads, not the
+    # event loop's default executor; match them to the DB pool
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
     init_db()
+    await fhir_client.startup()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await fhir_client.aclose()
+    await async_engine.dispose()
 
 @app.post("/api/auth/register", response_model=UserResponse)
 def register(user: UserCreate, db: Session = Depends(get_db)):
@@ -63,36 +135,67 @@ def register(user: UserCreate, db: Session = Depends(get_db)):
     
     return new_user
 
+# Cleared once no bcrypt hashes are left. New hashes are always argon2id,
+# so it never needs to be set again.
+_legacy_hashes_remain = True
+
+def _login_dummy_hash(db: Session) -> str:
+    """Dummy hash in the slowest scheme still stored, for unknown usernames"""
+    global _legacy_hashes_remain
+    if _legacy_hashes_remain:
+        _legacy_hashes_remain = db.scalar(
+            select(exists().where(LoginInformation.password.like("$2%")))
+        )
+    return LEGACY_DUMMY_HASH if _legacy_hashes_remain else DUMMY_HASH
+
 @app.post("/api/auth/login")
 def login(credentials: LoginRequest, db: Session = Depends(get_db)):
     user = db.query(LoginInformation).filter(
         LoginInformation.username == credentials.username
     ).first()
     
-    if not user or not verify_password(credentials.password, user.password):
+    if user is None:
+        verify_password(credentials.password, _login_dummy_hash(db))
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect username or password"
+        )
+
+    verified, new_hash = verify_and_update_password(credentials.password, user.password)
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password"
         )
     
     access_token = create_access_token(data={"sub": user.id})
-    
-    return {
+    response = {
         "access_token": access_token,
         "token_type": "bearer",
         "user_type": user.user_type,
         "user_id": user.id
     }
 
+    # Migrate bcrypt (or under-cost argon2) hashes to the current scheme
+    if new_hash is not None:
+        user.password = new_hash
+        db.commit()
+    
+    return response
+
 @app.get("/api/auth/me", response_model=UserResponse)
-async def get_me(current_user: LoginInformation = Depends(get_current_user)):
+async def get_me(current_user: CurrentUser = Depends(get_current_user)):
     return current_user
 
+# `async def` handlers await FHIR calls; any database work they do goes
+# through an AsyncSession (get_async_db) so it never blocks the event loop.
+# Plain `def` handlers run in the threadpool with the sync Session (get_db).
+
 @app.get("/api/fhir/patients/search")
 async def search_fhir_patients(
     name: str = None,
     language: str = None,
-    current_user: LoginInformation = Depends(require_staff)
+    current_user: CurrentUser = Depends(require_staff)
 ):
     patients = await fhir_client.search_patients(name=name, language=language)
     return {"count": len(patients), "patients": patients}
@@ -100,7 +203,7 @@ async def search_fhir_patients(
 @app.get("/api/fhir/patients/{fhir_id}")
 async def get_fhir_patient_details(
     fhir_id: str,
-    current_user: LoginInformation = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """
     Fetch complete FHIR Patient resource from HAPI FHIR server
@@ -139,14 +242,16 @@ async def get_fhir_patient_details(
 @app.post("/api/patients/sync/{fhir_id}", response_model=PatientResponse)
 async def sync_patient_from_fhir(
     fhir_id: str,
-    db: Session = Depends(get_db),
-    current_user: LoginInformation = Depends(require_staff)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(require_staff)
 ):
-    existing = db.query(PatientData).filter(PatientData.fhir_id == fhir_id).first()
+    existing = (await db.execute(
+        select(PatientData).where(PatientData.fhir_id == fhir_id)
+    )).scalar_one_or_none()
     if existing:
         return existing
     
-    fhir_patient = await fhir_client.get_patient(fhir_id)
+    fhir_patient = await fhir_client.get_patient(fhir_id, elements=PATIENT_ELEMENTS)
     if not fhir_patient:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -157,8 +262,8 @@ async def sync_patient_from_fhir(
     new_patient = PatientData(**patient_data)
     
     db.add(new_patient)
-    db.commit()
-    db.refresh(new_patient)
+    await db.commit()
+    await db.refresh(new_patient)
     
     return new_patient
 
@@ -167,7 +272,7 @@ def get_patients(
     skip: int = 0,
     limit: int = 100,
     db: Session = Depends(get_db),
-    current_user: LoginInformation = Depends(require_staff)
+    current_user: CurrentUser = Depends(require_staff)
 ):
     patients = db.query(PatientData).offset(skip).limit(limit).all()
     return patients
@@ -176,9 +281,9 @@ def get_patients(
 def get_patient(
     patient_id: str,
     db: Session = Depends(get_db),
-    current_user: LoginInformation = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
-    patient = db.query(PatientData).filter(PatientData.id == patient_id).first()
+    patient = db.get(PatientData, patient_id)
     if not patient:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -189,8 +294,8 @@ def get_patient(
 @app.post("/api/patients/create", response_model=PatientResponse)
 async def create_patient(
     patient_data: PatientCreate,
-    db: Session = Depends(get_db),
-    current_user: LoginInformation = Depends(require_staff)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(require_staff)
 ):
     """
     Create a new patient in FHIR server and sync to local database
@@ -224,23 +329,75 @@ async def create_patient(
 
         new_patient = PatientData(**parsed_data)
         db.add(new_patient)
-        db.commit()
-        db.refresh(new_patient)
+        await db.commit()
+        await db.refresh(new_patient)
 
         return new_patient
 
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create patient: {str(e)}"
         )
 
+@app.post("/api/patients/bulk", response_model=List[PatientResponse])
+async def create_patients_bulk(
+    patients_data: List[PatientCreate],
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(require_staff)
+):
+    """
+    Create several patients in FHIR server and sync them to the local
+    database with a single multi-row INSERT and one commit
+
+    Not atomic across the two systems: if any FHIR create fails, no local
+    rows are written, but the patients that FHIR did create are left there.
+    The error lists the failed input positions; the others can be brought
+    in with /api/patients/sync/{fhir_id}.
+    """
+    if not patients_data:
+        return []
+
+    # The FHIR creates are independent, so run them concurrently; the
+    # client caps how many are in flight against the FHIR server
+    fhir_patients = await fhir_client.create_patients(
+        [p.dict(exclude={"location"}) for p in patients_data]
+    )
+
+    failed = [i for i, fhir_patient in enumerate(fhir_patients) if fhir_patient is None]
+    if failed:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to create patients in FHIR server at positions: {failed}"
+        )
+
+    rows = [
+        {**fhir_client.parse_patient_resource(fhir_patient), "location": p.location}
+        for fhir_patient, p in zip(fhir_patients, patients_data)
+    ]
+
+    try:
+        new_patients = (await db.scalars(
+            insert(PatientData).returning(PatientData, sort_by_parameter_order=True),
+            rows,
+            execution_options=BULK_INSERT_OPTIONS
+        )).all()
+        await db.commit()
+        return new_patients
+
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to create patients: {str(e)}"
+        )
+
 @app.post("/api/interpreters", response_model=InterpreterWithLogin)
 def create_interpreter(
     interpreter: InterpreterCreate,
     db: Session = Depends(get_db),
-    current_user: LoginInformation = Depends(require_staff)
+    current_user: CurrentUser = Depends(require_staff)
 ):
     existing_user = db.query(LoginInformation).filter(
         LoginInformation.username == interpreter.username
@@ -292,7 +449,7 @@ def get_interpreters(
     language: str = None,
     available_only: bool = False,
     db: Session = Depends(get_db),
-    current_user: LoginInformation = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     query = db.query(InterpreterData)
     
@@ -309,39 +466,18 @@ def get_interpreters(
 
 @app.get("/api/interpreters/me", response_model=InterpreterResponse)
 def get_my_interpreter_profile(
-    db: Session = Depends(get_db),
-    current_user: LoginInformation = Depends(require_interpreter)
+    interpreter: InterpreterData = Depends(get_current_interpreter)
 ):
     """Get current interpreter's profile"""
-    interpreter = db.query(InterpreterData).filter(
-        InterpreterData.login_id == current_user.id
-    ).first()
-
-    if not interpreter:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Interpreter profile not found"
-        )
-
     return interpreter
 
 @app.patch("/api/interpreters/me", response_model=InterpreterResponse)
 def update_my_interpreter_profile(
     updates: InterpreterUpdate,
     db: Session = Depends(get_db),
-    current_user: LoginInformation = Depends(require_interpreter)
+    interpreter: InterpreterData = Depends(get_current_interpreter)
 ):
     """Update current interpreter's availability status"""
-    interpreter = db.query(InterpreterData).filter(
-        InterpreterData.login_id == current_user.id
-    ).first()
-
-    if not interpreter:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Interpreter profile not found"
-        )
-
     # Update availability status
     if updates.availability_status:
         interpreter.availability_status = updates.availability_status
@@ -358,16 +494,24 @@ def update_my_interpreter_profile(
 
 # CONTINUE FROM PART 2 - Add these functions to main.py
 
-@app.get("/api/requests", response_model=List[RequestWithDetails])
+@app.get("/api/requests", response_model=List[RequestListItem])
 def get_all_requests(
     skip: int = 0,
     limit: int = 100,
     status_filter: Optional[RequestStatus] = None,
     db: Session = Depends(get_db),
-    current_user: LoginInformation = Depends(require_staff)
+    current_user: CurrentUser = Depends(require_staff)
 ):
     """Get all interpreter requests with optional status filter"""
-    query = db.query(InterpreterRequest)
+    # The list view never shows the free-text notes, so leave those columns
+    # out of the SELECT; raiseload turns any stray access into an error
+    # rather than a per-row lazy load. GET /api/requests/{id} returns them.
+    query = db.query(InterpreterRequest).options(
+        defer(InterpreterRequest.request_notes, raiseload=True),
+        defer(InterpreterRequest.encounter_notes, raiseload=True),
+        selectinload(InterpreterRequest.patient),
+        selectinload(InterpreterRequest.interpreter)
+    )
 
     if status_filter:
         query = query.filter(InterpreterRequest.status == status_filter)
@@ -377,34 +521,17 @@ def get_all_requests(
         InterpreterRequest.requested_at.desc()
     ).offset(skip).limit(limit).all()
 
-    result = []
-    for req in requests:
-        patient = db.query(PatientData).filter(PatientData.id == req.patient_id).first()
-        interpreter = None
-        if req.interpreter_id:
-            interpreter = db.query(InterpreterData).filter(
-                InterpreterData.id == req.interpreter_id
-            ).first()
-
-        result.append(RequestWithDetails(
-            **req.__dict__,
-            patient=patient,
-            interpreter=interpreter
-        ))
-
-    return result
+    return requests
 
 @app.post("/api/requests", response_model=RequestResponse)
 def create_request(
     request: RequestCreate,
     db: Session = Depends(get_db),
-    current_user: LoginInformation = Depends(require_staff)
+    current_user: CurrentUser = Depends(require_staff)
 ):
     """Create new interpreter request"""
     # Verify patient exists
-    patient = db.query(PatientData).filter(
-        PatientData.id == request.patient_id
-    ).first()
+    patient = db.get(PatientData, request.patient_id)
 
     if not patient:
         raise HTTPException(
@@ -424,15 +551,50 @@ def create_request(
 
     return new_request
 
+@app.post("/api/requests/bulk", response_model=List[RequestResponse])
+def create_requests_bulk(
+    requests_data: List[RequestCreate],
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(require_staff)
+):
+    """Create several interpreter requests with a single multi-row INSERT"""
+    if not requests_data:
+        return []
+
+    # Verify all patients exist in one query
+    patient_ids = {r.patient_id for r in requests_data}
+    found_ids = set(db.scalars(
+        select(PatientData.id).where(PatientData.id.in_(patient_ids))
+    ))
+    missing_ids = patient_ids - found_ids
+
+    if missing_ids:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Patient not found: {', '.join(sorted(missing_ids))}"
+        )
+
+    new_requests = db.scalars(
+        insert(InterpreterRequest).returning(InterpreterRequest, sort_by_parameter_order=True),
+        [{"requested_by": current_user.id, **r.dict()} for r in requests_data],
+        execution_options=BULK_INSERT_OPTIONS
+    ).all()
+
+    # Serialize before commit, which expires the returned objects
+    response = [RequestResponse.model_validate(req) for req in new_requests]
+    db.commit()
+
+    return response
+
 @app.get("/api/requests/{request_id}", response_model=RequestWithDetails)
 def get_request(
     request_id: str,
     db: Session = Depends(get_db),
-    current_user: LoginInformation = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
-    request = db.query(InterpreterRequest).filter(
-        InterpreterRequest.id == request_id
-    ).first()
+    request = db.execute(
+        STMT_REQUEST_WITH_DETAILS, {"request_id": request_id}
+    ).scalar_one_or_none()
     
     if not request:
         raise HTTPException(
@@ -440,209 +602,163 @@ def get_request(
             detail="Request not found"
         )
     
-    patient = db.query(PatientData).filter(PatientData.id == request.patient_id).first()
-    interpreter = None
-    if request.interpreter_id:
-        interpreter = db.query(InterpreterData).filter(
-            InterpreterData.id == request.interpreter_id
-        ).first()
-    
-    return RequestWithDetails(
-        **request.__dict__,
-        patient=patient,
-        interpreter=interpreter
-    )
+    return request
 
 @app.get("/api/interpreter/requests/pending", response_model=List[RequestWithDetails])
 def get_pending_requests_for_interpreter(
     db: Session = Depends(get_db),
-    current_user: LoginInformation = Depends(require_interpreter)
+    interpreter: InterpreterData = Depends(get_current_interpreter)
 ):
-    interpreter = db.query(InterpreterData).filter(
-        InterpreterData.login_id == current_user.id
-    ).first()
+    requests = db.execute(
+        STMT_PENDING_BY_LANG, {"lang": interpreter.language}
+    ).scalars().all()
     
-    if not interpreter:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Interpreter profile not found"
-        )
-    
-    requests = db.query(InterpreterRequest).filter(
-        InterpreterRequest.language == interpreter.language,
-        InterpreterRequest.status == RequestStatus.PENDING
-    ).order_by(InterpreterRequest.is_stat.desc(), InterpreterRequest.requested_at).all()
-    
-    result = []
-    for req in requests:
-        patient = db.query(PatientData).filter(PatientData.id == req.patient_id).first()
-        result.append(RequestWithDetails(
-            **req.__dict__,
-            patient=patient,
-            interpreter=None
-        ))
-    
-    return result
+    return requests
 
 @app.get("/api/interpreter/requests/my", response_model=List[RequestWithDetails])
 def get_my_requests(
     db: Session = Depends(get_db),
-    current_user: LoginInformation = Depends(require_interpreter)
+    interpreter: InterpreterData = Depends(get_current_interpreter)
 ):
-    interpreter = db.query(InterpreterData).filter(
-        InterpreterData.login_id == current_user.id
-    ).first()
-    
-    if not interpreter:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Interpreter profile not found"
-        )
-    
-    requests = db.query(InterpreterRequest).filter(
+    # req.interpreter resolves from the session's identity map (it is the
+    # profile get_current_interpreter loaded), so only patients need loading
+    requests = db.query(InterpreterRequest).options(
+        selectinload(InterpreterRequest.patient)
+    ).filter(
         InterpreterRequest.interpreter_id == interpreter.id,
         InterpreterRequest.status.in_([RequestStatus.ACCEPTED])
     ).order_by(InterpreterRequest.accepted_at.desc()).all()
     
-    result = []
-    for req in requests:
-        patient = db.query(PatientData).filter(PatientData.id == req.patient_id).first()
-        result.append(RequestWithDetails(
-            **req.__dict__,
-            patient=patient,
-            interpreter=interpreter
-        ))
-    
-    return result
+    return requests
 
 @app.post("/api/interpreter/requests/{request_id}/accept", response_model=RequestResponse)
 def accept_request(
     request_id: str,
     db: Session = Depends(get_db),
-    current_user: LoginInformation = Depends(require_interpreter)
+    interpreter: InterpreterData = Depends(get_current_interpreter)
 ):
-    interpreter = db.query(InterpreterData).filter(
-        InterpreterData.login_id == current_user.id
-    ).first()
-    
-    if not interpreter:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Interpreter profile not found"
-        )
+    # Each UPDATE re-checks its precondition in the WHERE clause, so two
+    # concurrent accepts cannot both claim the same request or interpreter
+    claimed = db.execute(
+        update(InterpreterData).where(
+            InterpreterData.id == interpreter.id,
+            InterpreterData.availability_status == InterpreterAvailability.AVAILABLE
+        ).values(availability_status=InterpreterAvailability.BUSY)
+    ).rowcount
     
-    if interpreter.availability_status != InterpreterAvailability.AVAILABLE:
+    if not claimed:
+        db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="You must be available to accept requests"
         )
     
-    request = db.query(InterpreterRequest).filter(
-        InterpreterRequest.id == request_id
-    ).first()
+    request = db.execute(
+        update(InterpreterRequest).where(
+            InterpreterRequest.id == request_id,
+            InterpreterRequest.status == RequestStatus.PENDING,
+            InterpreterRequest.language == interpreter.language
+        ).values(
+            interpreter_id=interpreter.id,
+            status=RequestStatus.ACCEPTED,
+            accepted_at=datetime.utcnow()
+        ).returning(InterpreterRequest)
+    ).scalar_one_or_none()
     
     if not request:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Request not found"
-        )
-    
-    if request.status != RequestStatus.PENDING:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Request is not pending"
-        )
-    
-    if request.language != interpreter.language:
+        # Only failed accepts pay for the lookup that picks the error
+        db.rollback()
+        request = db.get(InterpreterRequest, request_id)
+        if not request:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Request not found"
+            )
+        if request.status != RequestStatus.PENDING:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Request is not pending"
+            )
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Request language does not match your language"
         )
     
-    request.interpreter_id = interpreter.id
-    request.status = RequestStatus.ACCEPTED
-    request.accepted_at = datetime.utcnow()
-    
-    interpreter.availability_status = InterpreterAvailability.BUSY
-    
+    response = RequestResponse.model_validate(request)
     db.commit()
-    db.refresh(request)
     
-    return request
+    return response
 
 @app.post("/api/interpreter/requests/{request_id}/complete", response_model=RequestResponse)
 def complete_request(
     request_id: str,
     updates: RequestUpdate,
     db: Session = Depends(get_db),
-    current_user: LoginInformation = Depends(require_interpreter)
+    interpreter: InterpreterData = Depends(get_current_interpreter)
 ):
-    interpreter = db.query(InterpreterData).filter(
-        InterpreterData.login_id == current_user.id
-    ).first()
-    
-    if not interpreter:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Interpreter profile not found"
-        )
+    values = {
+        "status": RequestStatus.COMPLETED,
+        "completed_at": datetime.utcnow()
+    }
+    if updates.encounter_notes:
+        values["encounter_notes"] = updates.encounter_notes
     
-    request = db.query(InterpreterRequest).filter(
-        InterpreterRequest.id == request_id,
-        InterpreterRequest.interpreter_id == interpreter.id
-    ).first()
+    request = db.execute(
+        update(InterpreterRequest).where(
+            InterpreterRequest.id == request_id,
+            InterpreterRequest.interpreter_id == interpreter.id,
+            InterpreterRequest.status == RequestStatus.ACCEPTED
+        ).values(**values).returning(InterpreterRequest)
+    ).scalar_one_or_none()
     
     if not request:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Request not found or not assigned to you"
-        )
-    
-    if request.status != RequestStatus.ACCEPTED:
+        # Only failed completes pay for the lookup that picks the error
+        db.rollback()
+        request = db.get(InterpreterRequest, request_id)
+        if not request or request.interpreter_id != interpreter.id:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Request not found or not assigned to you"
+            )
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Request is not in accepted status"
         )
     
-    request.status = RequestStatus.COMPLETED
-    request.completed_at = datetime.utcnow()
-    if updates.encounter_notes:
-        request.encounter_notes = updates.encounter_notes
-    
     interpreter.availability_status = InterpreterAvailability.AVAILABLE
     
+    response = RequestResponse.model_validate(request)
     db.commit()
-    db.refresh(request)
     
-    return request
+    return response
 
 @app.get("/api/dashboard/stats", response_model=DashboardStats)
 def get_dashboard_stats(
     db: Session = Depends(get_db),
-    current_user: LoginInformation = Depends(require_staff)
+    current_user: CurrentUser = Depends(require_staff)
 ):
-    available_count = db.query(InterpreterData).filter(
-        InterpreterData.availability_status == InterpreterAvailability.AVAILABLE
-    ).count()
-    
-    pending_count = db.query(InterpreterRequest).filter(
+    # One GROUP BY gives both the per-language and overall available counts
+    languages = db.query(
+        InterpreterData.language,
+        func.sum(case(
+            (InterpreterData.availability_status == InterpreterAvailability.AVAILABLE, 1),
+            else_=0
+        )).label("available_count")
+    ).group_by(InterpreterData.language).all()
+    
+    # Plain SELECT count(*); Query.count() would wrap a full-row subquery
+    pending_count = db.query(func.count()).select_from(InterpreterRequest).filter(
         InterpreterRequest.status == RequestStatus.PENDING
-    ).count()
-    
-    languages = db.query(InterpreterData.language).distinct().all()
+    ).scalar()
+    
+    availability_by_language = [
+        AvailabilityStats(language=lang, available_count=count)
+        for lang, count in languages
+    ]
+    available_count = sum(stats.available_count for stats in availability_by_language)
+    # Already grouped by language, so the row count is the distinct count
     total_languages = len(languages)
     
-    availability_by_language = []
-    for (lang,) in languages:
-        count = db.query(InterpreterData).filter(
-            InterpreterData.language == lang,
-            InterpreterData.availability_status == InterpreterAvailability.AVAILABLE
-        ).count()
-        
-        availability_by_language.append(
-            AvailabilityStats(language=lang, available_count=count)
-        )
-    
     return DashboardStats(
         available_interpreters=available_count,
         pending_requests=pending_count,
@@ -1,14 +1,26 @@
-from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey, Text, Enum
+from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey, Text, Enum, Index, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
+import os
+import time
 import uuid
 import enum
 
 Base = declarative_base()
 
 def generate_uuid():
-    return str(uuid.uuid4())
+    # UUIDv7: a millisecond timestamp prefix keeps new keys appending to the
+    # end of the primary key index instead of landing on random pages
+    rand = int.from_bytes(os.urandom(10), "big")
+    value = (
+        (time.time_ns() // 1_000_000) << 80
+        | 0x7 << 76
+        | (rand >> 62 & 0xFFF) << 64
+        | 0b10 << 62
+        | rand & (1 << 62) - 1
+    )
+    return str(uuid.UUID(int=value))
 
 class UserType(str, enum.Enum):
     STAFF = "staff"
@@ -63,13 +75,17 @@ class PatientData(Base):
 
 class InterpreterData(Base):
     __tablename__ = "interpreter_data"
+    __table_args__ = (
+        # Language lookups and the per-language availability counts
+        Index("ix_interp_lang_avail", "language", "availability_status"),
+    )
     
     id = Column(String, primary_key=True, default=generate_uuid)
     login_id = Column(String, ForeignKey("login_information.id"), unique=True, nullable=False)
     name = Column(String, nullable=False)
     phone_number = Column(String)
     email = Column(String)
-    language = Column(String, nullable=False, index=True)
+    language = Column(String, nullable=False)
     gender = Column(String)
     gender_preference = Column(String)
     availability_status = Column(Enum(InterpreterAvailability), default=InterpreterAvailability.AVAILABLE)
@@ -81,6 +97,12 @@ class InterpreterData(Base):
 
 class InterpreterRequest(Base):
     __tablename__ = "interpreter_requests"
+    __table_args__ = (
+        # Pending queue per language, ordered by STAT then request time
+        Index("ix_req_lang_status_stat_reqat", "language", "status", text("is_stat DESC"), "requested_at"),
+        # An interpreter's accepted requests, newest first
+        Index("ix_req_interp_status_accepted", "interpreter_id", "status", "accepted_at"),
+    )
     
     id = Column(String, primary_key=True, default=generate_uuid)
     requested_by = Column(String, ForeignKey("login_information.id"), nullable=False)
@@ -89,7 +111,7 @@ class InterpreterRequest(Base):
     
     location_method = Column(String, nullable=False)
     delivery_method = Column(Enum(DeliveryMethod), nullable=False)
-    language = Column(String, nullable=False, index=True)
+    language = Column(String, nullable=False)
     status = Column(Enum(RequestStatus), default=RequestStatus.PENDING, index=True)
     patient_type = Column(String)
     is_stat = Column(Boolean, default=False)
@@ -99,7 +99,8 @@ class RequestUpdate(BaseModel):
 class RequestAccept(BaseModel):
     pass
 
-class RequestResponse(BaseModel):
+class RequestSummary(BaseModel):
+    """Request fields without the free-text notes, for list views"""
     id: str
     patient_id: str
     interpreter_id: Optional[str] = None
@@ -110,8 +111,6 @@ class RequestResponse(BaseModel):
     patient_type: Optional[str] = None
     is_stat: bool
     duration_minutes: Optional[str] = None
-    request_notes: Optional[str] = None
-    encounter_notes: Optional[str] = None
     requested_at: datetime
     accepted_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
@@ -119,10 +118,18 @@ class RequestResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class RequestResponse(RequestSummary):
+    request_notes: Optional[str] = None
+    encounter_notes: Optional[str] = None
+
 class RequestWithDetails(RequestResponse):
     patient: PatientResponse
     interpreter: Optional[InterpreterResponse] = None
 
+class RequestListItem(RequestSummary):
+    patient: PatientResponse
+    interpreter: Optional[InterpreterResponse] = None
+
 # Dashboard Statistics
 class AvailabilityStats(BaseModel):
     language: str
@@ -1,216 +1,260 @@
-from sqlalchemy.orm import Session
-from database import SessionLocal, init_db
+from sqlalchemy import insert, text
+from sqlalchemy.exc import OperationalError
+from database import BULK_INSERT_OPTIONS, SessionLocal, init_db
 from models import LoginInformation, InterpreterData, PatientData, InterpreterRequest
 from models import UserType, RequestStatus, InterpreterAvailability, DeliveryMethod
-from auth import get_password_hash
+from auth import hash_password_fast
 from datetime import datetime, timedelta
 
+# Static seed rows, built once at import. seed_database() reads them and
+# never mutates them. Requests stay inside the function because they
+# reference generated ids and the seeding time.
+
+# Li Wei starts busy, assigned to the accepted request seeded below
+_INTERPRETERS = (
+    {"username": "interpreter_mandarin1", "name": "Li Wei", "language": "Mandarin", "availability_status": InterpreterAvailability.BUSY},
+    {"username": "interpreter_mandarin2", "name": "Chen Ming", "language": "Mandarin", "availability_status": InterpreterAvailability.AVAILABLE},
+    {"username": "interpreter_mandarin3", "name": "Wang Fang", "language": "Mandarin", "availability_status": InterpreterAvailability.AVAILABLE},
+    {"username": "interpreter_arabic1", "name": "Ahmed Hassan", "language": "Arabic", "availability_status": InterpreterAvailability.AVAILABLE},
+    {"username": "interpreter_arabic2", "name": "Fatima Al-Sayed", "language": "Arabic", "availability_status": InterpreterAvailability.AVAILABLE},
+    {"username": "interpreter_vietnamese1", "name": "Nguyen Van", "language": "Vietnamese", "availability_status": InterpreterAvailability.AVAILABLE},
+    {"username": "interpreter_tagalog1", "name": "Maria Santos", "language": "Tagalog", "availability_status": InterpreterAvailability.AVAILABLE},
+    {"username": "interpreter_spanish1", "name": "Carlos Rodriguez", "language": "Spanish", "availability_status": InterpreterAvailability.UNAVAILABLE},
+)
+
+_PATIENTS = (
+    {
+        "fhir_id": "patient-001",
+        "name": "Zhang Xiaoming",
+        "language": "Mandarin",
+        "location": "Ward 4A",
+        "birthdate": "1965-03-15",
+        "gender": "male",
+        "phone_number": "+1-555-0001",
+        "email": "zhang.x@email.com"
+    },
+    {
+        "fhir_id": "patient-002",
+        "name": "Mohammed Ali",
+        "language": "Arabic",
+        "location": "Emergency Department",
+        "birthdate": "1978-07-22",
+        "gender": "male",
+        "phone_number": "+1-555-0002",
+        "email": None
+    },
+    {
+        "fhir_id": "patient-003",
+        "name": "Tran Thi Lan",
+        "language": "Vietnamese",
+        "location": "Outpatient Clinic",
+        "birthdate": "1990-11-08",
+        "gender": "female",
+        "phone_number": "+1-555-0003",
+        "email": "tran.lan@email.com"
+    },
+    {
+        "fhir_id": "patient-004",
+        "name": "Liu Yong",
+        "language": "Mandarin",
+        "location": "Outpatient Clinic 3",
+        "birthdate": "1982-05-30",
+        "gender": "male",
+        "phone_number": "+1-555-0004",
+        "email": None
+    },
+    {
+        "fhir_id": "patient-005",
+        "name": "Hassan Ahmed",
+        "language": "Arabic",
+        "location": "Emergency Department",
+        "birthdate": "1995-09-12",
+        "gender": "male",
+        "phone_number": "+1-555-0005",
+        "email": None
+    },
+)
+
 def seed_database():
-    init_db()
-    db = SessionLocal()
+    # Nothing is read back after the commit, so don't expire anything on it
+    db = SessionLocal(expire_on_commit=False)
     
     try:
-        if db.query(LoginInformation).count() > 0:
+        # Check for data before init_db, so re-running against a seeded
+        # database skips the schema DDL and introspection entirely
+        try:
+            seeded = db.query(db.query(LoginInformation).exists()).scalar()
+        except OperationalError:
+            # Tables do not exist yet
+            db.rollback()
+            seeded = False
+        
+        if seeded:
             print("Database already contains data. Skipping seed.")
             return
         
+        init_db()
+        
         print("Seeding database...")
         
-        staff1 = LoginInformation(
-            username="staff1",
-            password=get_password_hash("password123"),
-            user_type=UserType.STAFF
-        )
+        # Seed data is disposable, so skip journaling and fsyncs for this
+        # run. Both pragmas are per-connection and end with this script.
+        db.execute(text("PRAGMA journal_mode=MEMORY"))
+        db.execute(text("PRAGMA synchronous=OFF"))
         
-        staff2 = LoginInformation(
-            username="admin1",
-            password=get_password_hash("password123"),
-            user_type=UserType.ADMIN
-        )
+        # Every seed account shares the same dev password, so hash it once
+        # and reuse it rather than paying for a slow hash per user. Set
+        # SEED_FAST_HASH=1 to also use minimal argon2 costs for it.
+        password_hash = hash_password_fast("password123")
         
-        db.add_all([staff1, staff2])
-        db.flush()
-        
-        interpreter_logins = []
-        interpreter_data = [
-            {"username": "interpreter_mandarin1", "name": "Li Wei", "language": "Mandarin"},
-            {"username": "interpreter_mandarin2", "name": "Chen Ming", "language": "Mandarin"},
-            {"username": "interpreter_mandarin3", "name": "Wang Fang", "language": "Mandarin"},
-            {"username": "interpreter_arabic1", "name": "Ahmed Hassan", "language": "Arabic"},
-            {"username": "interpreter_arabic2", "name": "Fatima Al-Sayed", "language": "Arabic"},
-            {"username": "interpreter_vietnamese1", "name": "Nguyen Van", "language": "Vietnamese"},
-            {"username": "interpreter_tagalog1", "name": "Maria Santos", "language": "Tagalog"},
-            {"username": "interpreter_spanish1", "name": "Carlos Rodriguez", "language": "Spanish"},
+        # Every table goes in through one multi-row INSERT rather than
+        # per-object unit-of-work bookkeeping. RETURNING with
+        # sort_by_parameter_order hands back generated ids in row order,
+        # which is all the later rows need to reference them.
+        logins = [
+            {"username": "staff1", "password": password_hash, "user_type": UserType.STAFF},
+            {"username": "admin1", "password": password_hash, "user_type": UserType.ADMIN},
+        ] + [
+            {"username": data["username"], "password": password_hash, "user_type": UserType.INTERPRETER}
+            for data in _INTERPRETERS
         ]
         
-        for data in interpreter_data:
-            login = LoginInformation(
-                username=data["username"],
-                password=get_password_hash("password123"),
-                user_type=UserType.INTERPRETER
-            )
-            db.add(login)
-            db.flush()
-            
-            interpreter = InterpreterData(
-                login_id=login.id,
-                name=data["name"],
-                language=data["language"],
-                phone_number=f"+1-555-{len(interpreter_logins):04d}",
-                email=f"{data['username']}@hospital.com",
-                gender="Other",
-                availability_status=InterpreterAvailability.AVAILABLE if data["language"] != "Spanish" else InterpreterAvailability.UNAVAILABLE
-            )
-            db.add(interpreter)
-            interpreter_logins.append((login, interpreter))
-        
-        db.flush()
-        
-        patients = [
-            PatientData(
-                fhir_id="patient-001",
-                name="Zhang Xiaoming",
-                language="Mandarin",
-                location="Ward 4A",
-                birthdate="1965-03-15",
-                gender="male",
-                phone_number="+1-555-0001",
-                email="zhang.x@email.com"
-            ),
-            PatientData(
-                fhir_id="patient-002",
-                name="Mohammed Ali",
-                language="Arabic",
-                location="Emergency Department",
-                birthdate="1978-07-22",
-                gender="male",
-                phone_number="+1-555-0002"
-            ),
-            PatientData(
-                fhir_id="patient-003",
-                name="Tran Thi Lan",
-                language="Vietnamese",
-                location="Outpatient Clinic",
-                birthdate="1990-11-08",
-                gender="female",
-                phone_number="+1-555-0003",
-                email="tran.lan@email.com"
-            ),
-            PatientData(
-                fhir_id="patient-004",
-                name="Liu Yong",
-                language="Mandarin",
-                location="Outpatient Clinic 3",
-                birthdate="1982-05-30",
-                gender="male",
-                phone_number="+1-555-0004"
-            ),
-            PatientData(
-                fhir_id="patient-005",
-                name="Hassan Ahmed",
-                language="Arabic",
-                location="Emergency Department",
-                birthdate="1995-09-12",
-                gender="male",
-                phone_number="+1-555-0005"
-            ),
+        staff1_id, staff2_id, *interpreter_login_ids = db.scalars(
+            insert(LoginInformation).returning(LoginInformation.id, sort_by_parameter_order=True),
+            logins
+        ).all()
+        
+        interpreters = [
+            {
+                "login_id": login_id,
+                "name": data["name"],
+                "language": data["language"],
+                "phone_number": f"+1-555-{index:04d}",
+                "email": f"{data['username']}@hospital.com",
+                "gender": "Other",
+                "availability_status": data["availability_status"]
+            }
+            for index, (login_id, data) in enumerate(zip(interpreter_login_ids, _INTERPRETERS))
         ]
         
-        db.add_all(patients)
-        db.flush()
-        
-        mandarin_interpreter = next(i for l, i in interpreter_logins if i.language == "Mandarin")
-        mandarin_interpreter.availability_status = InterpreterAvailability.BUSY
-        
-        request1 = InterpreterRequest(
-            requested_by=staff1.id,
-            patient_id=patients[0].id,
-            interpreter_id=mandarin_interpreter.id,
-            location_method="Ward 4A (30 min)",
-            delivery_method=DeliveryMethod.ONSITE,
-            language="Mandarin",
-            status=RequestStatus.ACCEPTED,
-            patient_type="Inpatient",
-            is_stat=False,
-            duration_minutes="30",
-            request_notes="Dr. Smith requires interpreter for informed consent discussion.",
-            requested_at=datetime.utcnow() - timedelta(hours=2),
-            accepted_at=datetime.utcnow() - timedelta(hours=1, minutes=30)
-        )
+        # First interpreter seeded for each language
+        interpreters_by_language = {}
+        for interpreter in interpreters:
+            interpreters_by_language.setdefault(interpreter["language"], interpreter)
         
-        request2 = InterpreterRequest(
-            requested_by=staff1.id,
-            patient_id=patients[1].id,
-            location_method="Phone Call (STAT)",
-            delivery_method=DeliveryMethod.TELEPHONE,
-            language="Arabic",
-            status=RequestStatus.PENDING,
-            patient_type="Emergency Department",
-            is_stat=True,
-            request_notes="Urgent - chest pain evaluation",
-            requested_at=datetime.utcnow() - timedelta(minutes=45)
-        )
+        mandarin_interpreter = interpreters_by_language["Mandarin"]
+        vietnamese_interpreter = interpreters_by_language["Vietnamese"]
         
-        vietnamese_interpreter = next(i for l, i in interpreter_logins if i.language == "Vietnamese")
-        request3 = InterpreterRequest(
-            requested_by=staff1.id,
-            patient_id=patients[2].id,
-            interpreter_id=vietnamese_interpreter.id,
-            location_method="Telehealth Link (60 min)",
-            delivery_method=DeliveryMethod.TELEHEALTH,
-            language="Vietnamese",
-            status=RequestStatus.COMPLETED,
-            patient_type="Outpatient",
-            is_stat=False,
-            duration_minutes="60",
-            request_notes="Follow-up consultation",
-            encounter_notes="Successfully completed telehealth session.",
-            requested_at=datetime.utcnow() - timedelta(days=1, hours=4),
-            accepted_at=datetime.utcnow() - timedelta(days=1, hours=3),
-            completed_at=datetime.utcnow() - timedelta(days=1, hours=2)
-        )
+        interpreter_ids = db.scalars(
+            insert(InterpreterData).returning(InterpreterData.id, sort_by_parameter_order=True),
+            interpreters
+        ).all()
+        for interpreter, interpreter_id in zip(interpreters, interpreter_ids):
+            interpreter["id"] = interpreter_id
         
-        request4 = InterpreterRequest(
-            requested_by=staff2.id,
-            patient_id=patients[3].id,
-            location_method="Outpatient Clinic 3 (60 min)",
-            delivery_method=DeliveryMethod.ONSITE,
-            language="Mandarin",
-            status=RequestStatus.PENDING,
-            patient_type="Outpatient",
-            is_stat=False,
-            duration_minutes="60",
-            requested_at=datetime.utcnow() - timedelta(minutes=30)
-        )
+        patient_ids = db.scalars(
+            insert(PatientData).returning(PatientData.id, sort_by_parameter_order=True),
+            list(_PATIENTS),
+            execution_options=BULK_INSERT_OPTIONS
+        ).all()
         
-        request5 = InterpreterRequest(
-            requested_by=staff1.id,
-            patient_id=patients[4].id,
-            location_method="Emergency Department",
-            delivery_method=DeliveryMethod.ONSITE,
-            language="Mandarin",
-            status=RequestStatus.PENDING,
-            patient_type="ED",
-            is_stat=True,
-            request_notes="Motor vehicle accident - consent needed for surgery",
-            requested_at=datetime.utcnow() - timedelta(minutes=5)
-        )
+        # One timestamp for the whole seed, so the relative times line up
+        now = datetime.utcnow()
+        requests = [
+            {
+                "requested_by": staff1_id,
+                "patient_id": patient_ids[0],
+                "interpreter_id": mandarin_interpreter["id"],
+                "location_method": "Ward 4A (30 min)",
+                "delivery_method": DeliveryMethod.ONSITE,
+                "language": "Mandarin",
+                "status": RequestStatus.ACCEPTED,
+                "patient_type": "Inpatient",
+                "is_stat": False,
+                "duration_minutes": "30",
+                "request_notes": "Dr. Smith requires interpreter for informed consent discussion.",
+                "requested_at": now - timedelta(hours=2),
+                "accepted_at": now - timedelta(hours=1, minutes=30)
+            },
+            {
+                "requested_by": staff1_id,
+                "patient_id": patient_ids[1],
+                "location_method": "Phone Call (STAT)",
+                "delivery_method": DeliveryMethod.TELEPHONE,
+                "language": "Arabic",
+                "status": RequestStatus.PENDING,
+                "patient_type": "Emergency Department",
+                "is_stat": True,
+                "request_notes": "Urgent - chest pain evaluation",
+                "requested_at": now - timedelta(minutes=45)
+            },
+            {
+                "requested_by": staff1_id,
+                "patient_id": patient_ids[2],
+                "interpreter_id": vietnamese_interpreter["id"],
+                "location_method": "Telehealth Link (60 min)",
+                "delivery_method": DeliveryMethod.TELEHEALTH,
+                "language": "Vietnamese",
+                "status": RequestStatus.COMPLETED,
+                "patient_type": "Outpatient",
+                "is_stat": False,
+                "duration_minutes": "60",
+                "request_notes": "Follow-up consultation",
+                "encounter_notes": "Successfully completed telehealth session.",
+                "requested_at": now - timedelta(days=1, hours=4),
+                "accepted_at": now - timedelta(days=1, hours=3),
+                "completed_at": now - timedelta(days=1, hours=2)
+            },
+            {
+                "requested_by": staff2_id,
+                "patient_id": patient_ids[3],
+                "location_method": "Outpatient Clinic 3 (60 min)",
+                "delivery_method": DeliveryMethod.ONSITE,
+                "language": "Mandarin",
+                "status": RequestStatus.PENDING,
+                "patient_type": "Outpatient",
+                "is_stat": False,
+                "duration_minutes": "60",
+                "requested_at": now - timedelta(minutes=30)
+            },
+            {
+                "requested_by": staff1_id,
+                "patient_id": patient_ids[4],
+                "location_method": "Emergency Department",
+                "delivery_method": DeliveryMethod.ONSITE,
+                "language": "Mandarin",
+                "status": RequestStatus.PENDING,
+                "patient_type": "ED",
+                "is_stat": True,
+                "request_notes": "Motor vehicle accident - consent needed for surgery",
+                "requested_at": now - timedelta(minutes=5)
+            },
+        ]
         
-        db.add_all([request1, request2, request3, request4, request5])
+        # Give every row the same keys so the requests go in as one batch
+        optional_columns = ("interpreter_id", "duration_minutes", "request_notes",
+                            "encounter_notes", "accepted_at", "completed_at")
+        for request in requests:
+            for column in optional_columns:
+                request.setdefault(column, None)
+        
+        db.execute(insert(InterpreterRequest), requests, execution_options=BULK_INSERT_OPTIONS)
         
         db.commit()
         
-        print("✓ Database seeded successfully!")
-        print("\nSample Credentials:")
-        print("\nStaff Login:")
-        print("  Username: staff1")
-        print("  Password: password123")
-        print("\nAdmin Login:")
-        print("  Username: admin1")
-        print("  Password: password123")
-        print("\nInterpreter Logins:")
-        print("  Username: interpreter_mandarin1")
-        print("  Password: password123")
+        print(
+            "✓ Database seeded successfully!\n"
+            "\nSample Credentials:\n"
+            "\nStaff Login:\n"
+            "  Username: staff1\n"
+            "  Password: password123\n"
+            "\nAdmin Login:\n"
+            "  Username: admin1\n"
+            "  Password: password123\n"
+            "\nInterpreter Logins:\n"
+            "  Username: interpreter_mandarin1\n"
+            "  Password: password123"
+        )
         
     except Exception as e:
         print(f"Error seeding database: {e}")